@@ -1,104 +1,241 @@
+import glob
+import hashlib
+import os
+from pathlib import Path
+
 import nox
 
 # Python versions from pyproject.toml
 PYTHON_VERSIONS = ['3.9', '3.10', '3.11', '3.12', '3.13']
 
+# Pinned [test] extras, regenerate after changing pyproject.toml with:
+# uv pip compile --universal --python-version 3.9 pyproject.toml --extra test -o requirements-test.txt
+TEST_REQUIREMENTS = 'requirements-test.txt'
 
-def _generate_stubs():
-    """Helper function to generate pyright stubs."""
-    import os
-    import shutil
+# Pinned pyright, installed once into a local prefix instead of npx -y per call
+PYRIGHT_VERSION = '1.1.405'
+PYRIGHT_PREFIX = Path('.nox/.stubs-node')
+
+# Hash of the Python sources the committed stubs were last generated from
+STUB_HASH_FILE = Path('python/.stub_hash')
+
+
+def _stub_source_hash():
+    """Hash of all Python sources that pyright generates stubs for."""
+    h = hashlib.sha256(PYRIGHT_VERSION.encode('utf-8'))
+    for pkg in ['cog', 'coglet']:
+        for p in sorted(Path('python', pkg).rglob('*.py')):
+            h.update(str(p).encode('utf-8'))
+            h.update(p.read_bytes())
+    return h.hexdigest()
+
+
+def _pyright():
+    """Path to the pinned pyright executable, installing it on first use."""
     import subprocess
 
-    # Check if npx is available
+    pyright = PYRIGHT_PREFIX / 'node_modules' / '.bin' / 'pyright'
+    version_file = PYRIGHT_PREFIX / '.version'
+    if version_file.exists() and version_file.read_text() == PYRIGHT_VERSION:
+        return str(pyright)
+
     try:
-        subprocess.run(['npx', '--version'], capture_output=True, check=True)
+        subprocess.run(
+            [
+                'npm',
+                'install',
+                '--prefix',
+                str(PYRIGHT_PREFIX),
+                f'pyright@{PYRIGHT_VERSION}',
+            ],
+            check=True,
+        )
     except (subprocess.CalledProcessError, FileNotFoundError):
         raise RuntimeError(
-            'npx not found. Please install Node.js to generate type stubs.\n'
+            f'Failed to install pyright@{PYRIGHT_VERSION} with npm. '
+            'Please install Node.js to generate type stubs.\n'
             'Visit: https://nodejs.org/ or use your package manager.'
         )
+    version_file.write_text(PYRIGHT_VERSION)
+    return str(pyright)
+
+
+def _generate_stubs():
+    """Helper function to generate pyright stubs."""
+    import shutil
+    import subprocess
+
+    source_hash = _stub_source_hash()
+    if STUB_HASH_FILE.exists() and STUB_HASH_FILE.read_text() == source_hash:
+        print('Stubs are up to date, skipping generation')
+        return
+
+    pyright = _pyright()
 
     # Remove existing stubs to avoid duplication
-    subprocess.run(['find', 'python', '-name', '*.pyi', '-type', 'f', '-delete'])
+    for p in Path('python').rglob('*.pyi'):
+        p.unlink()
 
-    # Generate stubs using npx pyright
+    # Generate stubs using pyright
     env = os.environ.copy()
     env['PYTHONPATH'] = 'python'
 
+    ok = True
     try:
-        subprocess.run(
-            ['npx', '-y', 'pyright', '--createstub', 'coglet'], env=env, check=True
-        )
+        subprocess.run([pyright, '--createstub', 'coglet'], env=env, check=True)
     except subprocess.CalledProcessError:
+        ok = False
         print('Warning: coglet stub creation may have failed')
 
     try:
-        subprocess.run(
-            ['npx', '-y', 'pyright', '--createstub', 'cog'], env=env, check=True
-        )
+        subprocess.run([pyright, '--createstub', 'cog'], env=env, check=True)
     except subprocess.CalledProcessError:
+        ok = False
         print('Warning: cog stub creation may have failed')
 
     # Move stubs from typings/ to alongside source
-    if os.path.exists('typings'):
-        shutil.copytree('typings', 'python', dirs_exist_ok=True)
-        shutil.rmtree('typings')
+    # Rename file by file, python/ already holds the sources so directories cannot be swapped
+    typings = Path('typings')
+    if typings.exists():
+        for src in typings.rglob('*.pyi'):
+            dest = Path('python') / src.relative_to(typings)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(src, dest)
+        shutil.rmtree(typings)
+
+    # Only cache complete generations so failures are retried next time
+    if ok:
+        STUB_HASH_FILE.write_text(source_hash)
 
 
 # Use uv for faster package installs
 nox.options.default_venv_backend = 'uv'
 
+# Keep session venvs between runs, see _install for how stale installs are detected
+nox.options.reuse_existing_virtualenvs = True
+
+
+def _install(session, *args):
+    """Install into the session venv, skipping dependency resolution when unchanged."""
+    h = hashlib.sha256(Path('pyproject.toml').read_bytes())
+    h.update('\0'.join(args).encode('utf-8'))
+    digest = h.hexdigest()
+
+    marker = Path(session.virtualenv.location) / '.install_cache'
+    if not marker.exists() or marker.read_text() != digest:
+        session.install(*args)
+        marker.write_text(digest)
+
+
+# Set by parallel_tests to the wheel it just built, test sessions install the source tree otherwise
+WHEEL_ENV = 'COGLET_TEST_WHEEL'
+
+# Venvs already set up by _install_test in this nox invocation
+_INSTALLED: set = set()
+
+
+def _install_test(session):
+    """Install pinned test dependencies, then the project without deps."""
+    key = session.virtualenv.location
+    if key in _INSTALLED:
+        return
+    # uv pip install leaves already satisfied pins alone, unlike uv pip sync it does not
+    # uninstall the project, which is not in the lock file
+    session.run_install(
+        'uv',
+        'pip',
+        'install',
+        '--python',
+        os.path.join(session.bin, 'python'),
+        '-r',
+        TEST_REQUIREMENTS,
+        external=True,
+    )
+    session.install('--no-deps', os.environ.get(WHEEL_ENV) or '.')
+    _INSTALLED.add(key)
 
-@nox.session(python=PYTHON_VERSIONS)
-def tests(session):
-    """Run tests with pytest-xdist parallelization."""
-    session.install('.[test]')
+
+def _run_pytest(session):
+    """Shared body of the test sessions."""
+    _install_test(session)
 
     # Pass through any arguments to pytest
-    pytest_args = ['-vv', '-n', 'auto'] + list(session.posargs)
+    pytest_args = list(session.posargs)
+
+    # Quiet by default so xdist workers send less report output to the main process,
+    # pass -v/-vv to opt back in
+    if not any(arg.startswith(('-v', '-q')) for arg in session.posargs):
+        pytest_args = ['-q', '--tb=short'] + pytest_args
 
-    # Only add -n auto if -n isn't already specified
-    if any(arg.startswith('-n') for arg in session.posargs):
-        pytest_args = ['-vv'] + list(session.posargs)
+    # Only pick workers if -n isn't already specified
+    if not any(arg.startswith('-n') for arg in session.posargs):
+        pytest_args = ['-n', 'auto', '--dist', 'worksteal'] + pytest_args
 
     session.run('pytest', *pytest_args)
 
 
-@nox.session(python='3.11')  # Single version for regular testing
-def test(session):
-    """Run tests on single Python version (faster for development)."""
-    session.install('.[test]')
+@nox.session
+def build(session):
+    """Build the coglet wheel, into the directory given as posarg or dist/."""
+    session.install('build', 'setuptools-scm')
+    outdir = session.posargs[0] if session.posargs else 'dist'
+    session.run('python', '-m', 'build', '--wheel', '--outdir', outdir)
 
-    # Pass through any arguments to pytest
-    pytest_args = ['-vv', '-n', 'auto'] + list(session.posargs)
 
-    # Only add -n auto if -n isn't already specified
-    if any(arg.startswith('-n') for arg in session.posargs):
-        pytest_args = ['-vv'] + list(session.posargs)
+@nox.session(python=PYTHON_VERSIONS)
+def tests(session):
+    """Run tests with pytest-xdist parallelization."""
+    _run_pytest(session)
 
-    session.run('pytest', *pytest_args)
 
+@nox.session(python=False, default=False)
+def parallel_tests(session):
+    """Run tests on all Python versions concurrently, splitting CPUs between them."""
+    import subprocess
+    import sys
+    import tempfile
+
+    # Build the wheel once so concurrent sessions do not race building the source tree
+    # A fresh directory makes sure the sessions test this build and not an older wheel
+    nox_cmd = [sys.executable, '-m', 'nox']
+    with tempfile.TemporaryDirectory(prefix='coglet-wheel-') as outdir:
+        session.run(*nox_cmd, '-s', 'build', '--', outdir, external=True)
+        (wheel,) = glob.glob(os.path.join(outdir, 'coglet-*.whl'))
+        env = dict(os.environ, **{WHEEL_ENV: os.path.abspath(wheel)})
+
+        workers = max(1, (os.cpu_count() or 1) // len(PYTHON_VERSIONS))
+        # Sessions share the working directory, give each its own coverage data and report
+        procs = {
+            v: subprocess.Popen(
+                nox_cmd
+                + ['-s', f'tests-{v}', '--', '-n', str(workers)]
+                + [f'--cov-report=html:htmlcov-{v}']
+                + session.posargs,
+                env=dict(env, COVERAGE_FILE=f'.coverage-{v}'),
+            )
+            for v in PYTHON_VERSIONS
+        }
+        failed = [v for v, p in procs.items() if p.wait() != 0]
+    if failed:
+        session.error(f'tests failed on Python {", ".join(failed)}')
 
-@nox.session(python=None)  # Use current system Python, but create venv
-def test_current(session):
-    """Run tests using current system Python with isolated venv (for CI)."""
-    session.install('.[test]')
 
-    # Pass through any arguments to pytest
-    pytest_args = ['-vv', '-n', 'auto'] + list(session.posargs)
+@nox.session(python='3.11')  # Single version for regular testing
+def test(session):
+    """Run tests on single Python version (faster for development)."""
+    _run_pytest(session)
 
-    # Only add -n auto if -n isn't already specified
-    if any(arg.startswith('-n') for arg in session.posargs):
-        pytest_args = ['-vv'] + list(session.posargs)
 
-    session.run('pytest', *pytest_args)
+@nox.session(python=None)  # Use current system Python, but create venv
+def test_current(session):
+    """Run tests using current system Python with isolated venv (for CI)."""
+    _run_pytest(session)
 
 
 @nox.session
 def lint(session):
     """Run ruff linting (check mode)."""
-    session.install('.[dev]')
+    _install(session, '.[dev]')
     # Check if --fix is in posargs for local dev
     check_only = '--fix' not in session.posargs
     session.log(f'running lint... {"[check_only]" if check_only else "[auto_fix]"}')
@@ -111,7 +248,7 @@ def lint(session):
 @nox.session
 def format(session):
     """Format code with ruff."""
-    session.install('.[dev]')
+    _install(session, '.[dev]')
     # Check mode for CI, format mode for local
     if '--check' in session.posargs:
         session.run('ruff', 'format', '--check', '.')
@@ -133,8 +270,6 @@ def stubs(session):
 @nox.session
 def typecheck(session):
     """Run mypy type checking."""
-    import os
-
     session.log('running typecheck...')
     # Only generate stubs if not in CI (CI validates existing stubs separately)
     if not os.environ.get('CI'):
@@ -144,7 +279,7 @@ def typecheck(session):
         session.log('done auto-generating python module stubs...')
 
     # Install dev deps (mypy) + test deps (pytest) + provided deps (pydantic)
-    session.install('.[dev,test,provided]')
+    _install(session, '.[dev,test,provided]')
     session.run(
         'mypy',
         '.',
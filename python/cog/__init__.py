@@ -1,17 +1,22 @@
+import importlib as _importlib
+import typing as _typing
+
 import coglet
-from coglet.api import (
-    AsyncConcatenateIterator,
-    BaseModel,
-    BasePredictor,
-    CancelationException,
-    Coder,
-    ConcatenateIterator,
-    ExperimentalFeatureWarning,
-    Input,
-    Path,
-    Secret,
-)
-from coglet.scope import current_scope
+
+if _typing.TYPE_CHECKING:
+    from coglet.api import (
+        AsyncConcatenateIterator,
+        BaseModel,
+        BasePredictor,
+        CancelationException,
+        Coder,
+        ConcatenateIterator,
+        ExperimentalFeatureWarning,
+        Input,
+        Path,
+        Secret,
+    )
+    from coglet.scope import current_scope
 
 __version__ = coglet.__version__
 
@@ -29,3 +34,34 @@ __all__ = [
     'current_scope',
     '__version__',
 ]
+
+# Re-exports are imported on first access (PEP 562) so that CLI wrappers under cog.command,
+# which exec the Go binary right away, do not pay for them
+_LAZY_EXPORTS = {
+    'AsyncConcatenateIterator': 'coglet.api',
+    'BaseModel': 'coglet.api',
+    'BasePredictor': 'coglet.api',
+    'CancelationException': 'coglet.api',
+    'Coder': 'coglet.api',
+    'ConcatenateIterator': 'coglet.api',
+    'ExperimentalFeatureWarning': 'coglet.api',
+    'Input': 'coglet.api',
+    'Path': 'coglet.api',
+    'Secret': 'coglet.api',
+    'current_scope': 'coglet.scope',
+}
+
+
+def __getattr__(name: str) -> _typing.Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(_importlib.import_module(module), name)
+    # Cache on the module so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> _typing.List[str]:
+    # Lazy exports are not in globals() until first accessed
+    return sorted(set(globals()) | set(__all__))
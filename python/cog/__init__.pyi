@@ -2,9 +2,19 @@
 This type stub file was generated by pyright.
 """
 
+import importlib as _importlib
+import typing as _typing
 import coglet
-from coglet.api import AsyncConcatenateIterator, BaseModel, BasePredictor, CancelationException, Coder, ConcatenateIterator, ExperimentalFeatureWarning, Input, Path, Secret
-from coglet.scope import current_scope
 
+if _typing.TYPE_CHECKING:
+    from coglet.api import AsyncConcatenateIterator, BaseModel, BasePredictor, CancelationException, Coder, ConcatenateIterator, ExperimentalFeatureWarning, Input, Path, Secret
+    from coglet.scope import current_scope
 __version__ = ...
 __all__ = ['AsyncConcatenateIterator', 'BaseModel', 'BasePredictor', 'CancelationException', 'Coder', 'ConcatenateIterator', 'ExperimentalFeatureWarning', 'Input', 'Path', 'Secret', 'current_scope', '__version__']
+_LAZY_EXPORTS = ...
+def __getattr__(name: str) -> _typing.Any:
+    ...
+
+def __dir__() -> _typing.List[str]:
+    ...
+
@@ -1,9 +1,16 @@
 import dataclasses
-from typing import Any, Optional, Type
+import functools
+from typing import Any, Optional, Tuple, Type
 
 from coglet import api
 
 
+@functools.lru_cache(maxsize=256)
+def _fields(cls: Type) -> Tuple[Tuple[str, Any], ...]:
+    # Field names and types per class instead of dataclasses.fields() per encode/decode
+    return tuple((f.name, f.type) for f in dataclasses.fields(cls))
+
+
 class DataclassCoder(api.Coder):
     @staticmethod
     def factory(cls: Type) -> Optional[api.Coder]:
@@ -22,16 +29,16 @@ class DataclassCoder(api.Coder):
 
     def _to_dict(self, cls: Type, x: Any) -> dict[str, Any]:
         r: dict[str, Any] = {}
-        for f in dataclasses.fields(cls):
-            v = getattr(x, f.name)
+        for name, tpe in _fields(cls):  # type: ignore
+            v = getattr(x, name)
             # Keep Path and Secret as is and let json.dumps(default=fn) handle them
-            if f.type is api.Path:
+            if tpe is api.Path:
                 v = api.Path(v) if type(v) is str else v
-            elif f.type is api.Secret:
+            elif tpe is api.Secret:
                 v = api.Secret(v) if type(v) is str else v
             elif dataclasses.is_dataclass(v):
-                v = self._to_dict(f.type, v)  # type: ignore
-            r[f.name] = v
+                v = self._to_dict(tpe, v)
+            r[name] = v
         return r
 
     def decode(self, x: dict[str, Any]) -> Any:
@@ -40,19 +47,18 @@ class DataclassCoder(api.Coder):
 
     def _from_dict(self, cls: Type, x: dict[str, Any]) -> Any:
         r: dict[str, Any] = {}
-        for f in dataclasses.fields(cls):
-            if f.name not in x:
+        for name, tpe in _fields(cls):  # type: ignore
+            if name not in x:
                 continue
-            elif f.type is api.Path:
-                r[f.name] = api.Path(x[f.name]) if type(x[f.name]) is str else x[f.name]
+            v = x[name]
+            if tpe is api.Path:
+                r[name] = api.Path(v) if type(v) is str else v
             # Secret is a dataclass and must be handled before other dataclasses
-            elif f.type is api.Secret:
-                r[f.name] = (
-                    api.Secret(x[f.name]) if type(x[f.name]) is str else x[f.name]
-                )
-            elif dataclasses.is_dataclass(f.type):
-                kwargs = self._from_dict(f.type, x[f.name])  # type: ignore
-                r[f.name] = f.type(**kwargs)  # type: ignore
+            elif tpe is api.Secret:
+                r[name] = api.Secret(v) if type(v) is str else v
+            elif dataclasses.is_dataclass(tpe):
+                kwargs = self._from_dict(tpe, v)  # type: ignore
+                r[name] = tpe(**kwargs)  # type: ignore
             else:
-                r[f.name] = x[f.name]
+                r[name] = v
         return r
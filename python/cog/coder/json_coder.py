@@ -1,24 +1,42 @@
+import functools
 import typing
-from typing import Any, Dict, Optional, Type
+from typing import Any, Dict, Hashable, Optional, Type, cast
 
 from coglet import api
 
+# Dict[str, Any] and dict[str, Any] share the same origin
+_DICT_ORIGIN = typing.get_origin(Dict[str, Any])
+
+
+@functools.lru_cache(maxsize=512)
+def _factory(cls: Type) -> Optional[api.Coder]:
+    if typing.get_origin(cls) is _DICT_ORIGIN:
+        # Only pay for get_args on dict hints, bare typing.Dict has no args
+        args = typing.get_args(cls)
+        if args and args[0] is str:
+            return JsonCoder()
+
+    try:
+        if isinstance(cls, type) and issubclass(cls, dict):
+            return JsonCoder()
+    except TypeError:
+        # Generic types like Set[Any] can't be used with issubclass in newer Python
+        pass
+
+    return None
+
 
 class JsonCoder(api.Coder):
+    # Dict[str, Any] hints, dict subclasses still go through the full scan
+    supported_types = (dict,)
+
     @staticmethod
     def factory(cls: Type) -> Optional[api.Coder]:
-        origin = typing.get_origin(cls)
-        if (origin in (dict, Dict)) and typing.get_args(cls)[0] is str:
-            return JsonCoder()
-
         try:
-            if issubclass(cls, dict):
-                return JsonCoder()
+            return _factory(cast(Hashable, cls))
         except TypeError:
-            # Generic types like Set[Any] can't be used with issubclass in newer Python
-            pass
-
-        return None
+            # Unhashable type hints cannot be cached
+            return _factory.__wrapped__(cls)
 
     def encode(self, x: Any) -> dict[str, Any]:
         return x
@@ -1,4 +1,3 @@
-import inspect
 import pathlib
 from typing import Any, Type
 
@@ -45,9 +44,7 @@ class BaseModelCoder(api.Coder):
     @staticmethod
     def factory(cls: Type):
         try:
-            if cls is not BaseModel and any(
-                c is BaseModel for c in inspect.getmro(cls)
-            ):
+            if cls is not BaseModel and issubclass(cls, BaseModel):
                 return BaseModelCoder(cls)
         except (AttributeError, TypeError):
             # Generic types like Set[Any] don't have __mro__ in newer Python versions
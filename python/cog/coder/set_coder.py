@@ -5,6 +5,8 @@ from coglet import api
 
 
 class SetCoder(api.Coder):
+    supported_types = (set,)
+
     @staticmethod
     def factory(cls: Type) -> Optional[api.Coder]:
         origin = typing.get_origin(cls)
@@ -1,33 +1,37 @@
 import os
-import os.path
-import platform
 import sys
-from pathlib import Path
-from typing import List
 
+# Resolved once at import, sys.platform needs no syscall and os.uname() is a single one
+_OS = sys.platform
+_MACHINE = os.uname().machine.lower() if hasattr(os, 'uname') else ''
+_GOOS = _OS if _OS in {'linux', 'darwin'} else None
+_GOARCH = {
+    'x86_64': 'amd64',
+    'amd64': 'amd64',
+    'aarch64': 'arm64',
+    'arm64': 'arm64',
+}.get(_MACHINE)
+
+# Binaries for all platforms are bundled in python/cog and the wheel is platform-independent,
+# so the binary is picked once per process rather than at build time
+_EXE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    f'cog-{_GOOS}-{_GOARCH}',
+)
 
-def run(subcmd: str, args: List[str]) -> None:
-    goos = platform.system().lower()
-    if goos not in {'linux', 'darwin'}:
-        print(f'Unsupported OS: {goos}')
-        sys.exit(1)
 
-    goarch = platform.machine().lower()
-    if goarch == 'x86_64':
-        goarch = 'amd64'
-    elif goarch == 'aarch64':
-        goarch = 'arm64'
-    if goarch not in {'amd64', 'arm64'}:
-        print(f'Unsupported architecture: {goarch}')
+def run(subcmd: str, args: list[str]) -> None:
+    if _GOOS is None:
+        print(f'Unsupported OS: {_OS}')
+        sys.exit(1)
+    if _GOARCH is None:
+        print(f'Unsupported architecture: {_MACHINE}')
         sys.exit(1)
 
-    # Binaries are bundled in python/cog
-    cmd = f'cog-{goos}-{goarch}'
-    exe = os.path.join(Path(__file__).parent.parent, cmd)
-    args = [exe, subcmd] + args
+    args = [_EXE, subcmd] + args
     # Replicate Go logger logs to stdout in production mode
     # Use stderr instead to be consistent with legacy Cog
     env = os.environ.copy()
     if 'LOG_FILE' not in env:
         env['LOG_FILE'] = 'stderr'
-    os.execve(exe, args, env)
+    os.execve(_EXE, args, env)
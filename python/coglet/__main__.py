@@ -5,27 +5,119 @@ import json
 import logging
 import os
 import os.path
+import select
 import sys
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional
 
-from coglet import file_runner, scope
+from coglet import file_runner, scope, util
+
+
+def _wait_inotify(path: str, timeout: float) -> Optional[bool]:
+    d, name = os.path.split(path)
+    # Wait for close instead of create so a partially written file is never read
+    fd = util.inotify_watch(d, util.IN_CLOSE_WRITE | util.IN_MOVED_TO)
+    if fd is None:
+        return None
+    try:
+        # File may have been written before the watch was added
+        if os.path.exists(path):
+            return True
+        target = os.fsencode(name)
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            r, _, _ = select.select([fd], [], [], remaining)
+            if not r:
+                return False
+            buf = os.read(fd, 4096)
+            i = 0
+            while i < len(buf):
+                _, _, _, n = util.INOTIFY_EVENT.unpack_from(buf, i)
+                i += util.INOTIFY_EVENT.size
+                if buf[i : i + n].rstrip(b'\0') == target:
+                    return True
+                i += n
+    finally:
+        os.close(fd)
+
+
+def _wait_kqueue(path: str, timeout: float) -> Optional[bool]:
+    # A platform check mypy understands, select has no kqueue attributes on Linux
+    if sys.platform != 'darwin':
+        return None
+    if not hasattr(select, 'kqueue'):
+        return None
+    try:
+        fd = os.open(os.path.dirname(path), os.O_RDONLY)
+    except OSError:
+        return None
+    kq = select.kqueue()
+    try:
+        ev = select.kevent(
+            fd,
+            filter=select.KQ_FILTER_VNODE,
+            flags=select.KQ_EV_ADD | select.KQ_EV_CLEAR,
+            fflags=select.KQ_NOTE_WRITE,
+        )
+        kq.control([ev], 0, 0)
+        deadline = time.monotonic() + timeout
+        while not os.path.exists(path):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not kq.control(None, 1, remaining):
+                return False
+        return True
+    finally:
+        kq.close()
+        os.close(fd)
+
+
+def _wait_for_file(path: str, timeout: float) -> bool:
+    """Block until path exists, returns False on timeout."""
+    if sys.platform == 'linux':
+        found = _wait_inotify(path, timeout)
+    elif sys.platform == 'darwin':
+        found = _wait_kqueue(path, timeout)
+    else:
+        found = None
+    if found is not None:
+        return found
+
+    # No file system events, poll instead with backoff from 1ms to 50ms
+    deadline = time.monotonic() + timeout
+    delay = 0.001
+    while True:
+        if os.path.exists(path):
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 1.5, 0.05)
 
 
 def pre_setup(logger: logging.Logger, working_dir: str) -> Optional[file_runner.Config]:
+    torch_import: Optional[Future] = None
     if os.environ.get('R8_TORCH_VERSION', '') != '':
         logger.info('eagerly importing torch')
-        importlib.import_module('torch')
-
-    # Cog server waits until user files become available and passes config to Python runner
-    conf_file = os.path.join(working_dir, 'config.json')
-    elapsed = 0.0
-    timeout = 60.0
-    while elapsed < timeout:
-        if os.path.exists(conf_file):
+        # Overlap the slow import with waiting for config
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='torch-import')
+        torch_import = executor.submit(importlib.import_module, 'torch')
+        executor.shutdown(wait=False)
+
+    try:
+        # Cog server waits until user files become available and passes config to Python runner
+        conf_file = os.path.join(working_dir, 'config.json')
+        timeout = 60.0
+        start = time.monotonic()
+        if _wait_for_file(conf_file, timeout):
+            elapsed = time.monotonic() - start
             logger.info(f'config file found after {elapsed:.2f}s: {conf_file}')
-            with open(conf_file, 'r') as f:
-                conf = json.load(f)
+            with open(conf_file, 'rb') as f:
+                conf = json.loads(f.read())
                 os.unlink(conf_file)
             config = file_runner.Config(
                 module_name=conf['module_name'],
@@ -36,18 +128,25 @@ def pre_setup(logger: logging.Logger, working_dir: str) -> Optional[file_runner.
             # Add user venv to PYTHONPATH
             pv = f'python{sys.version_info.major}.{sys.version_info.minor}'
             venv = os.path.join('/', 'root', '.venv', 'lib', pv, 'site-packages')
-            if venv is not None and venv not in sys.path and os.path.exists(venv):
+            # Compare normalized paths so equivalent entries are not added twice
+            in_path = os.path.normpath(venv) in {os.path.normpath(p) for p in sys.path}
+            if not in_path and os.path.exists(venv):
                 logger.info(f'adding venv to PYTHONPATH: {venv}')
                 sys.path.append(venv)
                 # In case the model forks Python interpreter
                 os.environ['PYTHONPATH'] = ':'.join(sys.path)
 
+            if torch_import is not None:
+                # Block on torch readiness and re-raise import errors
+                torch_import.result()
             return config
-        time.sleep(0.01)
-        elapsed += 0.01
 
-    logger.error(f'config file not found after {timeout:.2f}s: {conf_file}')
-    return None
+        logger.error(f'config file not found after {timeout:.2f}s: {conf_file}')
+        return None
+    finally:
+        if torch_import is not None:
+            # Join the import thread on every exit path, errors surface via result() above
+            torch_import.exception()
 
 
 def main() -> int:
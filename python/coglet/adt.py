@@ -1,28 +1,36 @@
 import dataclasses
+import functools
 import os
+import re
 import sys
 import typing
 from dataclasses import dataclass
-from enum import Enum, auto
-from typing import Any, Callable, Dict, List, Optional, Set, Union
+from enum import Enum, IntEnum, auto
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple, Union
 
 from cog.coder import dataclass_coder, json_coder, set_coder
 from coglet import api
 from coglet.util import type_name
 
+# Slotted dataclasses need Python 3.10+, no per-instance __dict__ for the many ADT objects
+_SLOTS: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-def _is_union(tpe: type) -> bool:
-    if typing.get_origin(tpe) is Union:
-        return True
-    if sys.version_info >= (3, 10):
-        from types import UnionType
 
-        if typing.get_origin(tpe) is UnionType:
-            return True
-    return False
+if sys.version_info >= (3, 10):
+    from types import UnionType
 
+    # Origins of Optional[X] and X | None
+    _UNION_ORIGINS: Tuple[Any, ...] = (Union, UnionType)
+else:
+    _UNION_ORIGINS = (Union,)
 
-class PrimitiveType(Enum):
+
+def _is_union_origin(origin: Any) -> bool:
+    return origin is not None and origin in _UNION_ORIGINS
+
+
+# IntEnum hashes in C, Enum.__hash__ is a Python call on every dispatch table lookup
+class PrimitiveType(IntEnum):
     BOOL = auto()
     FLOAT = auto()
     INTEGER = auto()
@@ -33,46 +41,10 @@ class PrimitiveType(Enum):
     CUSTOM = auto()
 
     @staticmethod
-    def _python_type() -> dict:
-        return {
-            PrimitiveType.BOOL: bool,
-            PrimitiveType.FLOAT: float,
-            PrimitiveType.INTEGER: int,
-            PrimitiveType.STRING: str,
-            PrimitiveType.PATH: api.Path,
-            PrimitiveType.SECRET: api.Secret,
-            PrimitiveType.ANY: Any,
-            PrimitiveType.CUSTOM: Any,
-        }
-
-    @staticmethod
-    def _json_type() -> dict:
-        return {
-            PrimitiveType.BOOL: 'boolean',
-            PrimitiveType.FLOAT: 'number',
-            PrimitiveType.INTEGER: 'integer',
-            PrimitiveType.STRING: 'string',
-            PrimitiveType.PATH: 'string',
-            PrimitiveType.SECRET: 'string',
-            PrimitiveType.ANY: 'object',
-            PrimitiveType.CUSTOM: 'object',
-        }
-
-    @staticmethod
-    def _adt_type() -> dict:
-        return {
-            bool: PrimitiveType.BOOL,
-            float: PrimitiveType.FLOAT,
-            int: PrimitiveType.INTEGER,
-            str: PrimitiveType.STRING,
-            api.Path: PrimitiveType.PATH,
-            api.Secret: PrimitiveType.SECRET,
-            Any: PrimitiveType.ANY,
-        }
-
-    @staticmethod
+    @functools.lru_cache(maxsize=256)
     def from_type(tpe: type) -> Any:
-        if match := PrimitiveType._adt_type().get(tpe):
+        # IntEnum members are ints, compare to None rather than truthiness
+        if (match := _ADT_TYPES.get(tpe)) is not None:
             return match
 
         try:
@@ -85,84 +57,239 @@ class PrimitiveType(Enum):
         return PrimitiveType.CUSTOM
 
     def normalize(self, value: Any) -> Any:
-        pt = PrimitiveType._python_type()[self]
-        tpe = type(value)
-        if self is PrimitiveType.CUSTOM:
-            # Custom type, leave as is
-            return value
-        elif self is PrimitiveType.ANY:
-            # Any type, accept any value as-is
-            return value
-        elif self in {self.PATH, self.SECRET}:
-            # String-ly types, only upcast
-            return value if tpe is pt else pt(value)
-        else:
-            if issubclass(tpe, Enum):
-                assert issubclass(tpe, pt), (
-                    f'enum {type_name(tpe)} is used as {type_name(pt)} but does not extend it'
-                )
-                value = value.value
-            v = pt(value)
-            assert v == value, f'failed to normalize value {value} as {type_name(pt)}'
-            return v
+        return _NORMALIZERS[self](value)
 
     def python_type(self) -> str:
-        return type_name(PrimitiveType._python_type()[self])
+        return type_name(_PYTHON_TYPES[self])
 
     def json_type(self) -> dict[str, Any]:
-        jt: dict[str, Any] = {'type': self._json_type()[self]}
-        if self is self.PATH:
-            jt['format'] = 'uri'
-        elif self is self.SECRET:
-            jt['format'] = 'password'
-            jt['writeOnly'] = True
-            jt['x-cog-secret'] = True
-        return jt
+        # Copy since callers add keys like title to the result
+        return dict(_JSON_TYPES[self])
 
     def json_encode(self, value: Any) -> Any:
-        if self is self.FLOAT:
-            return float(value)
-        elif self in {self.PATH, self.SECRET}:
-            # Leave these as is and let the file runner handle special encoding
-            return value
-        elif self is self.ANY:
-            # Any type, return as-is
-            return value
-        else:
-            return value
+        # Path and Secret are left as is for the file runner to handle special encoding
+        return float(value) if self is PrimitiveType.FLOAT else value
+
+
+# Lookup tables built once at import instead of per call
+_PYTHON_TYPES: Dict[PrimitiveType, Any] = {
+    PrimitiveType.BOOL: bool,
+    PrimitiveType.FLOAT: float,
+    PrimitiveType.INTEGER: int,
+    PrimitiveType.STRING: str,
+    PrimitiveType.PATH: api.Path,
+    PrimitiveType.SECRET: api.Secret,
+    PrimitiveType.ANY: Any,
+    PrimitiveType.CUSTOM: Any,
+}
+
+_JSON_TYPES: Dict[PrimitiveType, Dict[str, Any]] = {
+    PrimitiveType.BOOL: {'type': 'boolean'},
+    PrimitiveType.FLOAT: {'type': 'number'},
+    PrimitiveType.INTEGER: {'type': 'integer'},
+    PrimitiveType.STRING: {'type': 'string'},
+    PrimitiveType.PATH: {'type': 'string', 'format': 'uri'},
+    PrimitiveType.SECRET: {
+        'type': 'string',
+        'format': 'password',
+        'writeOnly': True,
+        'x-cog-secret': True,
+    },
+    PrimitiveType.ANY: {'type': 'object'},
+    PrimitiveType.CUSTOM: {'type': 'object'},
+}
+
+_ADT_TYPES: Dict[Any, PrimitiveType] = {
+    bool: PrimitiveType.BOOL,
+    float: PrimitiveType.FLOAT,
+    int: PrimitiveType.INTEGER,
+    str: PrimitiveType.STRING,
+    api.Path: PrimitiveType.PATH,
+    api.Secret: PrimitiveType.SECRET,
+    Any: PrimitiveType.ANY,
+}
+
+
+def _normalize_as_is(value: Any) -> Any:
+    # Any and custom types, accept any value as-is
+    return value
+
+
+def _normalize_upcast(pt: type) -> Callable[[Any], Any]:
+    # String-ly types, only upcast
+    def _normalize(value: Any) -> Any:
+        return value if type(value) is pt else pt(value)
+
+    return _normalize
+
+
+def _normalize_exact(pt: type) -> Callable[[Any], Any]:
+    def _normalize(value: Any) -> Any:
+        tpe = type(value)
+        if issubclass(tpe, Enum):
+            assert issubclass(tpe, pt), (
+                f'enum {type_name(tpe)} is used as {type_name(pt)} but does not extend it'
+            )
+            value = value.value
+        v = pt(value)
+        assert v == value, f'failed to normalize value {value} as {type_name(pt)}'
+        return v
+
+    return _normalize
+
+
+# One dict lookup per value instead of rebuilding the type table and branching
+_NORMALIZERS: Dict[PrimitiveType, Callable[[Any], Any]] = {
+    PrimitiveType.BOOL: _normalize_exact(bool),
+    PrimitiveType.FLOAT: _normalize_exact(float),
+    PrimitiveType.INTEGER: _normalize_exact(int),
+    PrimitiveType.STRING: _normalize_exact(str),
+    PrimitiveType.PATH: _normalize_upcast(api.Path),
+    PrimitiveType.SECRET: _normalize_upcast(api.Secret),
+    PrimitiveType.ANY: _normalize_as_is,
+    PrimitiveType.CUSTOM: _normalize_as_is,
+}
+
+
+# Memoized FieldType.from_type results for non-custom types
+_FIELD_TYPES: Dict[Any, 'FieldType'] = {}
+
+
+def _optional(f: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def _f(value: Any) -> Any:
+        return None if value is None else f(value)
 
+    return _f
 
-class Repetition(Enum):
+
+def _repeated(f: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def _f(value: Any) -> Any:
+        return [f(x) for x in value]
+
+    return _f
+
+
+def _repeated_typed(pt: type, f: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    only_pt = {pt}
+
+    def _f(value: Any) -> Any:
+        # Common case of a list with only exact pt elements, copy without converting or checking
+        if type(value) is list and set(map(type, value)) <= only_pt:
+            return value.copy()
+        return [f(x) for x in value]
+
+    return _f
+
+
+def _repeated_upcast(pt: type) -> Callable[[Any], Any]:
+    only_pt = {pt}
+    only_str = {str}
+
+    def _f(value: Any) -> Any:
+        types = set(map(type, value))
+        if types <= only_pt:
+            return list(value)
+        # Usually all plain strings from JSON, construct with a C-level map
+        if types <= only_str:
+            return list(map(pt, value))
+        return [x if type(x) is pt else pt(x) for x in value]
+
+    return _f
+
+
+class Repetition(IntEnum):
     REQUIRED = 1
     OPTIONAL = 2
     REPEATED = 3
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class FieldType:
     primitive: PrimitiveType
     repetition: Repetition
     coder: Optional[api.Coder]
+    # Resolved once from the fields above instead of branching per value
+    _normalize: Callable[[Any], Any] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+    _json_encode: Callable[[Any], Any] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+    _json_decode: Callable[[Any], Any] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        normalize = _NORMALIZERS[self.primitive]
+        if self.repetition is Repetition.OPTIONAL:
+            normalize = _optional(normalize)
+        elif self.repetition is Repetition.REPEATED:
+            pt = _PYTHON_TYPES[self.primitive]
+            if normalize is _normalize_as_is:
+                normalize = list
+            elif (
+                self.primitive is PrimitiveType.PATH
+                or self.primitive is PrimitiveType.SECRET
+            ):
+                normalize = _repeated_upcast(pt)
+            else:
+                normalize = _repeated_typed(pt, normalize)
+
+        encode: Callable[[Any], Any]
+        decode: Callable[[Any], Any]
+        if self.primitive is PrimitiveType.CUSTOM:
+            assert self.coder is not None, 'missing coder for custom type'
+            encode = self.coder.encode
+            decode = self.coder.decode
+        else:
+            encode = self.primitive.json_encode
+            # Primitive inputs are already decoded JSON values
+            decode = _normalize_as_is
+        if self.repetition is Repetition.REPEATED:
+            encode = _repeated(encode)
+            if decode is not _normalize_as_is:
+                decode = _repeated(decode)
+
+        object.__setattr__(self, '_normalize', normalize)
+        object.__setattr__(self, '_json_encode', encode)
+        object.__setattr__(self, '_json_decode', decode)
 
     @staticmethod
     def from_type(tpe: type):
+        try:
+            return _FIELD_TYPES[tpe]
+        except (KeyError, TypeError):
+            # TypeError for unhashable type hints
+            pass
+        ft = FieldType._from_type(tpe)
+        # Custom types depend on registered coders, which Coder.lookup caches and invalidates
+        if ft.coder is None:
+            try:
+                _FIELD_TYPES[tpe] = ft
+            except TypeError:
+                pass
+        return ft
+
+    @staticmethod
+    def _from_type(tpe: type):
         origin = typing.get_origin(tpe)
 
         # Handle bare collection types first
         if tpe is list:
             # Bare list -> List[Any]
             tpe = List[Any]
-            origin = typing.get_origin(tpe)
+            origin = list
         elif tpe is dict:
             # Bare dict -> Dict[str, Any]
             tpe = Dict[str, Any]
-            origin = typing.get_origin(tpe)
+            origin = dict
         elif tpe is set:
             # Bare set -> Set[Any]
             tpe = Set[Any]
-            origin = typing.get_origin(tpe)
+            origin = set
 
-        if origin in (list, List):
+        # get_origin returns the builtin for both List[T] and list[T]
+        if origin is list:
             t_args = typing.get_args(tpe)
             if t_args:
                 assert len(t_args) == 1, 'List must have one type argument'
@@ -176,7 +303,7 @@ class FieldType:
                 # Bare list type without type arguments, treat as List[Any]
                 elem_t = Any
             repetition = Repetition.REPEATED
-        elif _is_union(tpe):
+        elif _is_union_origin(origin):
             t_args = typing.get_args(tpe)
             assert len(t_args) == 2 and type(None) in t_args, (
                 f'unsupported union type {tpe}'
@@ -203,15 +330,7 @@ class FieldType:
         return FieldType(primitive=cog_t, repetition=repetition, coder=coder)
 
     def normalize(self, value: Any) -> Any:
-        if self.repetition is Repetition.REQUIRED:
-            return self.primitive.normalize(value)
-        elif self.repetition is Repetition.OPTIONAL:
-            return None if value is None else self.primitive.normalize(value)
-        elif self.repetition is Repetition.REPEATED:
-            return [self.primitive.normalize(v) for v in value]
-        else:
-            # Should not reach here
-            return value
+        return self._normalize(value)
 
     def json_type(self) -> dict[str, Any]:
         if self.repetition is Repetition.REPEATED:
@@ -220,24 +339,10 @@ class FieldType:
             return self.primitive.json_type()
 
     def json_encode(self, value: Any) -> Any:
-        f: Callable[[Any], Any] = self.primitive.json_encode
-        if self.primitive is PrimitiveType.CUSTOM:
-            assert self.coder is not None
-            f = self.coder.encode
-        if self.repetition is Repetition.REPEATED:
-            return [f(x) for x in value]
-        else:
-            return f(value)
+        return self._json_encode(value)
 
     def json_decode(self, value: Any) -> Any:
-        if self.primitive is not PrimitiveType.CUSTOM:
-            return value
-        assert self.coder is not None
-        f = self.coder.decode
-        if self.repetition is Repetition.REPEATED:
-            return [f(x) for x in value]
-        else:
-            return f(value)
+        return self._json_decode(value)
 
     def python_type(self) -> str:
         if self.repetition is Repetition.REQUIRED:
@@ -251,7 +356,7 @@ class FieldType:
             return self.primitive.python_type()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class Input:
     name: str
     order: int
@@ -265,9 +370,17 @@ class Input:
     regex: Optional[str] = None
     choices: Optional[List[Union[str, int]]] = None
     deprecated: Optional[bool] = None
+    # Compiled once when the predictor is inspected, not per prediction
+    compiled_regex: Optional[re.Pattern] = dataclasses.field(
+        default=None, compare=False, repr=False
+    )
+    # Hashed once for membership checks, choices keeps the declared order for the schema
+    choice_set: Optional[FrozenSet[Union[str, int]]] = dataclasses.field(
+        default=None, compare=False, repr=False
+    )
 
 
-class Kind(Enum):
+class Kind(IntEnum):
     SINGLE = 1
     LIST = 2
     ITERATOR = 3
@@ -275,12 +388,97 @@ class Kind(Enum):
     OBJECT = 5
 
 
-@dataclass(frozen=True)
+_MISSING = object()
+
+
+def _object_transform(
+    plan: Tuple[Tuple[str, Callable[[Any], Any], bool], ...],
+) -> Callable[[Any], Any]:
+    # Field name, transform and whether None is allowed, resolved once per Output
+    def _f(value: Any) -> Any:
+        for name, f, optional in plan:
+            v = getattr(value, name, _MISSING)
+            assert v is not _MISSING, f'missing output field: {name} {value}'
+            if v is None:
+                assert optional, f'missing value for output field: {name}'
+            setattr(value, name, f(v))
+        return value
+
+    return _f
+
+
+def _object_encoder(transform: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def _f(value: Any) -> Any:
+        o = transform(value)
+        # Further expand Output into dict
+        return {name: getattr(o, name) for name in _dataclass_field_names(type(o))}
+
+    return _f
+
+
+# Field names per output class instead of dataclasses.fields() per encoded object
+_DATACLASS_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+
+def _dataclass_field_names(tpe: type) -> Tuple[str, ...]:
+    names = _DATACLASS_FIELD_NAMES.get(tpe)
+    if names is None:
+        assert dataclasses.is_dataclass(tpe), f'{tpe} is not a dataclass'
+        names = tuple(f.name for f in dataclasses.fields(tpe))
+        _DATACLASS_FIELD_NAMES[tpe] = names
+    return names
+
+
+@dataclass(frozen=True, **_SLOTS)
 class Output:
     kind: Kind
     type: Optional[PrimitiveType] = None
     fields: Optional[Dict[str, FieldType]] = None
     coder: Optional[api.Coder] = None
+    # Resolved once from kind, type and coder instead of branching per value
+    _normalize: Callable[[Any], Any] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+    _json_encode: Callable[[Any], Any] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        kind = self.kind
+        normalize: Callable[[Any], Any] = self._unsupported
+        encode: Callable[[Any], Any] = self._unsupported
+        if kind is Kind.SINGLE or kind is Kind.ITERATOR or kind is Kind.CONCAT_ITERATOR:
+            assert self.type is not None
+            normalize = self.type.normalize
+            encode = self.type.json_encode
+        elif kind is Kind.LIST:
+            assert self.type is not None
+            normalize = _repeated(self.type.normalize)
+            encode = _repeated(self.type.json_encode)
+        elif kind is Kind.OBJECT:
+            assert self.fields is not None
+            normalize = _object_transform(
+                tuple(
+                    (name, ft.normalize, ft.repetition is Repetition.OPTIONAL)
+                    for name, ft in self.fields.items()
+                )
+            )
+            encode = _object_encoder(
+                _object_transform(
+                    tuple(
+                        (name, ft.json_encode, ft.repetition is Repetition.OPTIONAL)
+                        for name, ft in self.fields.items()
+                    )
+                )
+            )
+
+        if self.coder is not None:
+            encode = self.coder.encode
+            if kind is Kind.LIST:
+                encode = _repeated(encode)
+
+        object.__setattr__(self, '_normalize', normalize)
+        object.__setattr__(self, '_json_encode', encode)
 
     def json_type(self) -> dict[str, Any]:
         jt: dict[str, Any] = {'title': 'Output'}
@@ -324,54 +522,17 @@ class Output:
             )
         return jt
 
-    def _transform(self, value: Any, json: bool) -> Any:
-        if self.kind in {Kind.SINGLE, Kind.ITERATOR, Kind.CONCAT_ITERATOR}:
-            assert self.type is not None
-            f: Callable[[Any], Any] = (
-                self.type.json_encode if json else self.type.normalize
-            )
-            return f(value)
-        elif self.kind is Kind.LIST:
-            assert self.type is not None
-            f = self.type.json_encode if json else self.type.normalize
-            return [f(x) for x in value]
-        elif self.kind is Kind.OBJECT:
-            assert self.fields is not None
-            for name, ft in self.fields.items():
-                f = ft.json_encode if json else ft.normalize
-                assert hasattr(value, name), f'missing output field: {name} {value}'
-                v = getattr(value, name)
-                if v is None:
-                    assert ft.repetition is Repetition.OPTIONAL, (
-                        f'missing value for output field: {name}'
-                    )
-                setattr(value, name, f(v))
-            return value
-        raise RuntimeError(f'unsupported output kind {self.kind}')
+    def _unsupported(self, value: Any) -> Any:
+        raise RuntimeError(f'unsupported output kind {self.kind.name}')
 
     def normalize(self, value: Any) -> Any:
-        return self._transform(value, json=False)
+        return self._normalize(value)
 
     def json_encode(self, value: Any) -> Any:
-        if self.coder is not None:
-            if self.kind is Kind.LIST:
-                return [self.coder.encode(x) for x in value]
-            else:
-                return self.coder.encode(value)
-        o = self._transform(value, json=True)
-        if self.kind is Kind.OBJECT:
-            # Further expand Output into dict
-            tpe = type(o)
-            assert dataclasses.is_dataclass(tpe), f'{tpe} is not a dataclass'
-            r = {}
-            for f in dataclasses.fields(o):
-                r[f.name] = getattr(o, f.name)
-            return r
-        else:
-            return o
+        return self._json_encode(value)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class Predictor:
     module_name: str
     predictor_name: str  # class or function
@@ -2,12 +2,20 @@
 This type stub file was generated by pyright.
 """
 
+import functools
+import re
+import sys
 from dataclasses import dataclass
-from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from enum import IntEnum
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Union
 from coglet import api
 
-class PrimitiveType(Enum):
+_SLOTS: Dict[str, Any] = ...
+if sys.version_info >= (3, 10):
+    _UNION_ORIGINS: Tuple[Any, ...] = ...
+else:
+    _UNION_ORIGINS = ...
+class PrimitiveType(IntEnum):
     BOOL = ...
     FLOAT = ...
     INTEGER = ...
@@ -17,6 +25,7 @@ class PrimitiveType(Enum):
     ANY = ...
     CUSTOM = ...
     @staticmethod
+    @functools.lru_cache(maxsize=256)
     def from_type(tpe: type) -> Any:
         ...
     
@@ -34,7 +43,12 @@ class PrimitiveType(Enum):
     
 
 
-class Repetition(Enum):
+_PYTHON_TYPES: Dict[PrimitiveType, Any] = ...
+_JSON_TYPES: Dict[PrimitiveType, Dict[str, Any]] = ...
+_ADT_TYPES: Dict[Any, PrimitiveType] = ...
+_NORMALIZERS: Dict[PrimitiveType, Callable[[Any], Any]] = ...
+_FIELD_TYPES: Dict[Any, FieldType] = ...
+class Repetition(IntEnum):
     REQUIRED = ...
     OPTIONAL = ...
     REPEATED = ...
@@ -45,6 +59,12 @@ class FieldType:
     primitive: PrimitiveType
     repetition: Repetition
     coder: Optional[api.Coder]
+    _normalize: Callable[[Any], Any] = ...
+    _json_encode: Callable[[Any], Any] = ...
+    _json_decode: Callable[[Any], Any] = ...
+    def __post_init__(self) -> None:
+        ...
+    
     @staticmethod
     def from_type(tpe: type): # -> FieldType:
         ...
@@ -80,9 +100,11 @@ class Input:
     regex: Optional[str] = ...
     choices: Optional[List[Union[str, int]]] = ...
     deprecated: Optional[bool] = ...
+    compiled_regex: Optional[re.Pattern] = ...
+    choice_set: Optional[FrozenSet[Union[str, int]]] = ...
 
 
-class Kind(Enum):
+class Kind(IntEnum):
     SINGLE = ...
     LIST = ...
     ITERATOR = ...
@@ -90,12 +112,19 @@ class Kind(Enum):
     OBJECT = ...
 
 
+_MISSING = ...
+_DATACLASS_FIELD_NAMES: Dict[type, Tuple[str, ...]] = ...
 @dataclass(frozen=True)
 class Output:
     kind: Kind
     type: Optional[PrimitiveType] = ...
     fields: Optional[Dict[str, FieldType]] = ...
     coder: Optional[api.Coder] = ...
+    _normalize: Callable[[Any], Any] = ...
+    _json_encode: Callable[[Any], Any] = ...
+    def __post_init__(self) -> None:
+        ...
+    
     def json_type(self) -> dict[str, Any]:
         ...
     
@@ -1,6 +1,7 @@
 import copy
 import pathlib
 import sys
+import typing
 from abc import ABC, abstractmethod
 from dataclasses import MISSING, Field, dataclass, is_dataclass
 from enum import Enum
@@ -27,14 +28,44 @@ from typing_extensions import ParamSpec
 
 # Encoding between a custom type and JSON dict[str, Any]
 class Coder:
-    _coders: set = set()
+    # Registration order, so the first matching coder wins deterministically
+    _coders: list = []
+    # Resolved lookup() results by type, reset whenever a new coder is registered
+    _lookup_cache: dict = {}
+    # Coders by the origin types they declare in supported_types, tried before the full scan
+    _by_type: dict = {}
 
     @staticmethod
     def register(coder) -> None:
-        Coder._coders.add(coder)
+        if coder not in Coder._coders:
+            Coder._coders.append(coder)
+            for t in getattr(coder, 'supported_types', ()):
+                Coder._by_type.setdefault(t, []).append(coder)
+            Coder._lookup_cache.clear()
 
     @staticmethod
     def lookup(tpe: Type) -> Optional[Any]:
+        try:
+            return Coder._lookup_cache[tpe]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable type hint, resolve without caching
+            return Coder._lookup(tpe)
+        c = Coder._lookup(tpe)
+        Coder._lookup_cache[tpe] = c
+        return c
+
+    @staticmethod
+    def _lookup(tpe: Type) -> Optional[Any]:
+        try:
+            candidates = Coder._by_type.get(typing.get_origin(tpe) or tpe, ())
+        except TypeError:
+            candidates = ()
+        for cls in candidates:
+            c = cls.factory(tpe)
+            if c is not None:
+                return c
         for cls in Coder._coders:
             c = cls.factory(tpe)
             if c is not None:
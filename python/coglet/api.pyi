@@ -9,7 +9,9 @@ from typing import Any, AsyncIterator, Callable, Generic, Iterator, List, Option
 from typing_extensions import ParamSpec
 
 class Coder:
-    _coders: set = ...
+    _coders: list = ...
+    _lookup_cache: dict = ...
+    _by_type: dict = ...
     @staticmethod
     def register(coder) -> None:
         ...
@@ -1,5 +1,5 @@
 import ast
-from typing import Callable, List
+from typing import Callable, List, Optional
 
 
 def format_errs(
@@ -8,12 +8,15 @@ def format_errs(
     start = max(0, lineno - 2)
     end = min(len(lines), lineno + 2)
     w = len(str(end))
+    # Line number width is fixed per error, build the format once
+    line_fmt = f'%-{w}d | %s'
+    pad = ' ' * w
     errs = [f'{file}:{lineno}:{col_offset}: {msg}']
     for i in range(start, end):
-        errs.append(f'%-{w}d | %s' % (i, lines[i]))
+        errs.append(line_fmt % (i, lines[i]))
         if i == lineno:
-            errs.append('%s | %s^' % (' ' * w, ' ' * col_offset))
-    errs.append('%s = help: %s' % (' ' * w, help_msg))
+            errs.append(f'{pad} | {" " * col_offset}^')
+    errs.append(f'{pad} = help: {help_msg}')
     return '\n'.join(errs)
 
 
@@ -23,11 +26,20 @@ def visit(
     name: str,
     lines: List[str],
     f: Callable[[ast.AST, str, str, List[str]], List[str]],
+    descend: Optional[Callable[[ast.AST], bool]] = None,
 ) -> List[str]:
-    errs = []
-    for node in ast.iter_child_nodes(root):
-        errs += f(node, file, name, lines)
-        errs += visit(node, file, name, lines, f)
+    errs: List[str] = []
+    # Iterative pre-order traversal, children are pushed reversed to keep source order
+    stack = list(ast.iter_child_nodes(root))
+    stack.reverse()
+    while stack:
+        node = stack.pop()
+        errs.extend(f(node, file, name, lines))
+        if descend is not None and not descend(node):
+            continue
+        children = list(ast.iter_child_nodes(node))
+        children.reverse()
+        stack.extend(children)
     return errs
 
 
@@ -88,6 +100,10 @@ def inspect_optional(
     return errs
 
 
+def _outside_function(node: ast.AST) -> bool:
+    return type(node) not in (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+
+
 def inspect(file: str, method: str):
     with open(file, 'r') as f:
         content = f.read()
@@ -96,7 +112,9 @@ def inspect(file: str, method: str):
     # line numbers are 1-indexed
     lines = [''] + content.splitlines()
 
-    errs = visit(root, file, method, lines, inspect_optional)
+    # Predictors are module level functions or class methods, possibly under if/try/with
+    # Their own bodies are not searched for nested definitions
+    errs = visit(root, file, method, lines, inspect_optional, _outside_function)
     if len(errs) > 0:
         errs = ['error-prone usage of default=None'] + errs
         raise AssertionError('\n\n'.join(errs))
@@ -1,12 +1,16 @@
 import asyncio
+import http.client
 import json
 import logging
 import os
 import pathlib
+import queue
 import re
 import signal
 import tempfile
-import urllib.request
+import threading
+import time
+import urllib.parse
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
@@ -24,11 +28,16 @@ class FileRunner:
     CANCEL_RE = re.compile(r'^cancel-(?P<pid>\S+)$')
     REQUEST_RE = re.compile(r'^request-(?P<pid>\S+).json$')
     RESPONSE_FMT = 'response-{pid}-{epoch:05d}.json'
+    # Minimum seconds between partial responses of iterator predictions
+    # Each partial response holds all output so far, throttle to avoid rewriting it for every chunk
+    PARTIAL_RESPONSE_INTERVAL = 0.05
 
     # IPC status updates to Go server
     IPC_READY = 'READY'
     IPC_BUSY = 'BUSY'
     IPC_OUTPUT = 'OUTPUT'
+    # Seconds to wait for the Go server, a stuck IPC call must not hang shutdown
+    IPC_TIMEOUT = 5.0
 
     def __init__(
         self,
@@ -45,6 +54,15 @@ class FileRunner:
         self.working_dir = working_dir
         self.config = config
         self.runner: Optional[runner.Runner] = None
+        # Keep-alive connection to the Go server, reused across IPC calls
+        u = urllib.parse.urlsplit(ipc_url)
+        self._ipc_host = u.hostname or 'localhost'
+        self._ipc_port = u.port
+        self._ipc_path = (u.path or '/') + (f'?{u.query}' if u.query else '')
+        self._ipc_conn: Optional[http.client.HTTPConnection] = None
+        # Statuses are posted in order by a background thread, None stops it
+        self._ipc_queue: queue.SimpleQueue[Optional[str]] = queue.SimpleQueue()
+        self._ipc_thread: Optional[threading.Thread] = None
 
     async def start(self) -> int:
         self.logger.info(
@@ -60,14 +78,12 @@ class FileRunner:
         stop_file = os.path.join(self.working_dir, 'stop')
         openapi_file = os.path.join(self.working_dir, 'openapi.json')
         ready_file = os.path.join(self.working_dir, 'ready')
-        if os.path.exists(setup_result_file):
-            os.unlink(setup_result_file)
-        if os.path.exists(stop_file):
-            os.unlink(stop_file)
-        if os.path.exists(openapi_file):
-            os.unlink(openapi_file)
-        if os.path.exists(ready_file):
-            os.unlink(ready_file)
+        # Remove leftovers from a previous run, one syscall each instead of exists + unlink
+        for path in (setup_result_file, stop_file, openapi_file, ready_file):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
 
         self.logger.info('setup started')
         setup_result: Dict[str, Any] = {'started_at': util.now_iso()}
@@ -116,75 +132,124 @@ class FileRunner:
         # Ignore it here and require shutdown from parent Go server
         signal.signal(signal.SIGINT, signal.SIG_IGN)
 
-        ready = True
-        self._send_ipc(FileRunner.IPC_READY)
-        # Go server cannot receive IPC yet when a procedure is starting
-        # Write a ready file as signal
-        with open(ready_file, 'w') as f:
-            pass
+        # Wake up on file system events instead of polling working_dir
+        # Go writes then closes request files, watch close instead of create to never read a partial file
+        wakeup = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        fd = util.inotify_watch(
+            self.working_dir,
+            util.IN_CLOSE_WRITE | util.IN_MOVED_TO,
+            util.IN_CLOEXEC | util.IN_NONBLOCK,
+        )
+        timeout: Optional[float] = None
+        if fd is None:
+            # No inotify, e.g. macOS, poll instead
+            timeout = 0.1
+        else:
+            loop.add_reader(fd, self._drain_inotify, fd, wakeup)
 
+        cancel_match = self.CANCEL_RE.match
+        request_match = self.REQUEST_RE.match
         pending: Dict[str, asyncio.Task[None]] = {}
-        while True:
-            if not ready and len(pending) < self.config.max_concurrency:
-                ready = True
-                self._send_ipc(FileRunner.IPC_READY)
-
-            if os.path.exists(stop_file):
-                self.logger.info('stopping file runner')
-                tasks = []
-                for pid, task in pending.items():
-                    if not task.done():
-                        task.cancel()
-                        tasks.append(task)
-                        self.logger.info('prediction canceled: id=%s', pid)
-                await asyncio.gather(*tasks)
-                # Flush any remaining buffered output before shutdown
-                scope.flush_all_buffers()
-                return 0
-
-            for entry in os.listdir(self.working_dir):
-                m = self.CANCEL_RE.match(entry)
-                if m is not None:
-                    os.unlink(os.path.join(self.working_dir, entry))
-                    pid = m.group('pid')
-                    t = pending.get(pid)
-                    if t is None:
-                        self.logger.warning(
-                            'failed to cancel non-existing prediction: id=%s', pid
-                        )
-                    elif t.done():
-                        self.logger.warning(
-                            'failed to cancel completed prediction: id=%s', pid
-                        )
-                    else:
-                        t.cancel()
-                        self.logger.info('canceling prediction: id=%s', pid)
-                    continue
 
-                m = self.REQUEST_RE.match(entry)
-                if m is None:
-                    continue
-                pid = m.group('pid')
-                req_path = os.path.join(self.working_dir, entry)
-                with open(req_path, 'r') as f:
-                    req = json.load(f)
-                os.unlink(req_path)
-
-                if ready and len(pending) + 1 == self.config.max_concurrency:
-                    ready = False
-                    self._send_ipc(FileRunner.IPC_BUSY)
-                pending[pid] = asyncio.create_task(self._predict(pid, req))
-                self.logger.info('prediction started: id=%s', pid)
-
-            done_pids = []
-            for pid, task in pending.items():
-                if not task.done():
-                    continue
-                done_pids.append(pid)
-            for pid in done_pids:
+        def _on_done(task: asyncio.Task[None]) -> None:
+            # Free capacity as soon as a prediction completes and wake up to send READY
+            pid = task.get_name()
+            if pending.get(pid) is task:
                 del pending[pid]
+            wakeup.set()
 
-            await asyncio.sleep(0.1)
+        try:
+            ready = True
+            self._send_ipc(FileRunner.IPC_READY)
+            # Go server cannot receive IPC yet when a procedure is starting
+            # Write a ready file as signal
+            with open(ready_file, 'w') as f:
+                pass
+
+            while True:
+                # Clear before scanning so events during the scan trigger another pass
+                wakeup.clear()
+                if not ready and len(pending) < self.config.max_concurrency:
+                    ready = True
+                    self._send_ipc(FileRunner.IPC_READY)
+
+                # One directory read per pass, also covers the stop file
+                with os.scandir(self.working_dir) as it:
+                    entries = list(it)
+                if any(entry.name == 'stop' for entry in entries):
+                    self.logger.info('stopping file runner')
+                    tasks = []
+                    for pid, task in pending.items():
+                        if not task.done():
+                            task.cancel()
+                            tasks.append(task)
+                            self.logger.info('prediction canceled: id=%s', pid)
+                    await asyncio.gather(*tasks)
+                    # Flush any remaining buffered output before shutdown
+                    scope.flush_all_buffers()
+                    return 0
+
+                for entry in entries:
+                    name = entry.name
+                    # Most entries are responses and other files, only run the regex on candidates
+                    m = cancel_match(name) if name.startswith('cancel-') else None
+                    if m is not None:
+                        os.unlink(entry.path)
+                        pid = m.group('pid')
+                        t = pending.get(pid)
+                        if t is None:
+                            self.logger.warning(
+                                'failed to cancel non-existing prediction: id=%s', pid
+                            )
+                        elif t.done():
+                            self.logger.warning(
+                                'failed to cancel completed prediction: id=%s', pid
+                            )
+                        else:
+                            t.cancel()
+                            self.logger.info('canceling prediction: id=%s', pid)
+                        continue
+
+                    if not name.startswith('request-'):
+                        continue
+                    m = request_match(name)
+                    if m is None:
+                        continue
+                    pid = m.group('pid')
+                    with open(entry.path, 'rb') as req_file:
+                        req = json.loads(req_file.read())
+                    os.unlink(entry.path)
+
+                    if ready and len(pending) + 1 == self.config.max_concurrency:
+                        ready = False
+                        self._send_ipc(FileRunner.IPC_BUSY)
+                    pending[pid] = asyncio.create_task(
+                        self._predict(pid, req), name=pid
+                    )
+                    pending[pid].add_done_callback(_on_done)
+                    self.logger.info('prediction started: id=%s', pid)
+
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # Also on errors and cancellation, the fd and IPC thread would leak otherwise
+            if fd is not None:
+                loop.remove_reader(fd)
+                os.close(fd)
+            self._stop_ipc()
+
+    @staticmethod
+    def _drain_inotify(fd: int, wakeup: asyncio.Event) -> None:
+        # Events only trigger a scan of working_dir, discard them
+        try:
+            while os.read(fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        wakeup.set()
 
     async def _predict(self, pid: str, req: Dict[str, Any]) -> None:
         assert self.runner is not None
@@ -206,6 +271,8 @@ class FileRunner:
         # Write partial response, e.g. starting, processing, if webhook is set
         is_async = 'webhook' in req
         epoch = 0
+        # Trailing partial response for outputs that arrived inside the throttle interval
+        flush: Optional[asyncio.TimerHandle] = None
         try:
             if is_async:
                 self._respond(pid, epoch, resp)
@@ -222,15 +289,34 @@ class FileRunner:
                 resp['output'] = []
                 resp['status'] = 'processing'
                 scope.ctx_pid.set(pid)
+                loop = asyncio.get_running_loop()
+                # First output is always written as it changes status to processing
+                last_partial = -self.PARTIAL_RESPONSE_INTERVAL
+
+                def _partial() -> None:
+                    nonlocal epoch, flush, last_partial
+                    flush = None
+                    self._respond(pid, epoch, resp)
+                    epoch += 1
+                    last_partial = time.monotonic()
+
                 async for o in self.runner.predict_iter(req_in):
                     # Test JSON serialization in case of invalid output
                     o = self.runner.output.json_encode(o)
                     json.dumps(o, default=util.output_json)
 
                     resp['output'].append(o)
-                    if is_async:
-                        self._respond(pid, epoch, resp)
-                        epoch += 1
+                    # A scheduled trailing flush writes resp as is and already includes o
+                    if not is_async or flush is not None:
+                        continue
+                    wait = (
+                        last_partial + self.PARTIAL_RESPONSE_INTERVAL - time.monotonic()
+                    )
+                    if wait <= 0:
+                        _partial()
+                    else:
+                        # Send within the interval even if the iterator yields nothing else
+                        flush = loop.call_later(wait, _partial)
             else:
                 scope.ctx_pid.set(pid)
                 o = await self.runner.predict(req_in)
@@ -256,6 +342,9 @@ class FileRunner:
             scope.ctx_pid.set(None)
             self.logger.exception('prediction failed: id=%s %s', pid, e)
         finally:
+            # Outputs still pending are part of the final response
+            if flush is not None:
+                flush.cancel()
             resp['completed_at'] = util.now_iso()
         self._respond(pid, epoch, resp)
         scope.cleanup_prediction_context(pid)
@@ -274,11 +363,11 @@ class FileRunner:
             resp['metrics'].update(m)
 
         # Write to a temp file and atomically rename to avoid Go server picking up an incomplete file
-        (_, temp_path) = tempfile.mkstemp(
+        (fd, temp_path) = tempfile.mkstemp(
             suffix='.json', prefix=f'response-{pid}-{epoch}'
         )
-        with open(temp_path, 'w') as f:
-            json.dump(resp, f, default=util.output_json)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(util.json_dumps(resp, default=util.output_json))
         resp_path = os.path.join(
             self.working_dir, self.RESPONSE_FMT.format(pid=pid, epoch=epoch)
         )
@@ -287,13 +376,68 @@ class FileRunner:
         self._send_ipc(FileRunner.IPC_OUTPUT)
 
     def _send_ipc(self, status: str) -> None:
+        # Do not block the event loop or a running prediction on the round trip
+        if self._ipc_thread is None:
+            self._ipc_thread = threading.Thread(
+                target=self._ipc_worker, name='ipc', daemon=True
+            )
+            self._ipc_thread.start()
+        self._ipc_queue.put(status)
+
+    def _stop_ipc(self) -> None:
+        # Deliver queued statuses before shutting down
+        if self._ipc_thread is not None:
+            self._ipc_queue.put(None)
+            self._ipc_thread.join()
+            self._ipc_thread = None
+
+    def _ipc_worker(self) -> None:
+        while True:
+            status = self._ipc_queue.get()
+            if status is None:
+                self._close_ipc()
+                return
+            self._post_status(status)
+
+    def _post_status(self, status: str) -> None:
         try:
             payload = {
                 'name': self.name,
                 'pid': os.getpid(),
                 'status': status,
             }
-            data = json.dumps(payload).encode('utf-8')
-            urllib.request.urlopen(self.ipc_url, data=data).read()
+            data = util.json_dumps(payload)
+            reused = self._ipc_conn is not None
+            try:
+                self._post_ipc(data)
+            except (ConnectionResetError, BrokenPipeError):
+                # Server may have closed the idle keep-alive connection, retry once on a new one
+                # Other errors, e.g. timeouts, may come after the status was delivered
+                self._close_ipc()
+                if not reused:
+                    raise
+                self._post_ipc(data)
         except Exception as e:
+            self._close_ipc()
             self.logger.exception('IPC failed: %s', e)
+
+    def _post_ipc(self, data: bytes) -> None:
+        if self._ipc_conn is None:
+            self._ipc_conn = http.client.HTTPConnection(
+                self._ipc_host, self._ipc_port, timeout=self.IPC_TIMEOUT
+            )
+        self._ipc_conn.request(
+            'POST',
+            self._ipc_path,
+            body=data,
+            headers={'Content-Type': 'application/json'},
+        )
+        resp = self._ipc_conn.getresponse()
+        resp.read()
+        if resp.status >= 400:
+            raise RuntimeError(f'IPC failed with status {resp.status} {resp.reason}')
+
+    def _close_ipc(self) -> None:
+        if self._ipc_conn is not None:
+            self._ipc_conn.close()
+            self._ipc_conn = None
@@ -17,9 +17,11 @@ class FileRunner:
     CANCEL_RE = ...
     REQUEST_RE = ...
     RESPONSE_FMT = ...
+    PARTIAL_RESPONSE_INTERVAL = ...
     IPC_READY = ...
     IPC_BUSY = ...
     IPC_OUTPUT = ...
+    IPC_TIMEOUT = ...
     def __init__(self, *, logger: logging.Logger, name: str, ipc_url: str, working_dir: str, config: Config) -> None:
         ...
     
@@ -1,3 +1,4 @@
+import functools
 import importlib
 import inspect
 import re
@@ -6,14 +7,33 @@ import warnings
 from dataclasses import MISSING, Field
 from enum import Enum
 from types import ModuleType
-from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Type
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
 from coglet import adt, api, asts
 from coglet.util import type_name
 
 
 def _check_parent(child: type, parent: type) -> bool:
-    return any(c is parent for c in inspect.getmro(child))
+    # C-level check against the MRO cached on the class
+    return issubclass(child, parent)
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_regex(pattern: str) -> re.Pattern:
+    return re.compile(pattern)
 
 
 def _validate_setup(f: Callable) -> None:
@@ -113,7 +133,7 @@ def _validate_input(name: str, ft: adt.FieldType, cog_in: api.FieldInfo) -> None
             f'incompatible input type for regex: {in_repr}'
         )
         if defaults:
-            regex = re.compile(cog_in.regex)
+            regex = _compile_regex(cog_in.regex)
             assert all(regex.match(x) for x in defaults), (
                 f'default={def_repr} not a regex match for input: {in_repr}'
             )
@@ -136,9 +156,15 @@ def _validate_input(name: str, ft: adt.FieldType, cog_in: api.FieldInfo) -> None
             if isinstance(c, Enum):
                 c = cog_t.normalize(c)
             choices.append(c)
-        assert all(adt.PrimitiveType.from_type(type(x)) is cog_t for x in choices), (
-            f'not all choices have the same type as input: {in_repr}'
-        )
+        # from_type is lru_cached, mypy only accepts Hashable arguments
+        assert all(
+            adt.PrimitiveType.from_type(cast(Hashable, type(x))) is cog_t
+            for x in choices
+        ), f'not all choices have the same type as input: {in_repr}'
+
+
+def _float_or_none(v: Optional[Union[int, float]]) -> Optional[float]:
+    return None if v is None else float(v)
 
 
 def _input_adt(
@@ -182,13 +208,18 @@ def _input_adt(
             type=ft,
             default=default,
             description=cog_in.description,
-            ge=float(cog_in.ge) if cog_in.ge is not None else None,
-            le=float(cog_in.le) if cog_in.le is not None else None,
+            ge=_float_or_none(cog_in.ge),
+            le=_float_or_none(cog_in.le),
             min_length=cog_in.min_length,
             max_length=cog_in.max_length,
             regex=cog_in.regex,
             choices=choices,
             deprecated=cog_in.deprecated,
+            # Shares the cached pattern with _validate_input when defaults were checked
+            compiled_regex=None
+            if cog_in.regex is None
+            else _compile_regex(cog_in.regex),
+            choice_set=None if choices is None else frozenset(choices),
         )
 
 
@@ -211,12 +242,47 @@ class AnyType:
 _any_type = AnyType()
 
 
+def _output_fast_paths() -> Dict[Any, Tuple[adt.Kind, adt.PrimitiveType]]:
+    primitives = {
+        bool: adt.PrimitiveType.BOOL,
+        float: adt.PrimitiveType.FLOAT,
+        int: adt.PrimitiveType.INTEGER,
+        str: adt.PrimitiveType.STRING,
+        api.Path: adt.PrimitiveType.PATH,
+        api.Secret: adt.PrimitiveType.SECRET,
+    }
+    paths: Dict[Any, Tuple[adt.Kind, adt.PrimitiveType]] = {}
+    for t, pt in primitives.items():
+        paths[t] = (adt.Kind.SINGLE, pt)
+        paths[List[t]] = (adt.Kind.LIST, pt)  # type: ignore
+        paths[list[t]] = (adt.Kind.LIST, pt)  # type: ignore
+        paths[Iterator[t]] = (adt.Kind.ITERATOR, pt)  # type: ignore
+        paths[AsyncIterator[t]] = (adt.Kind.ITERATOR, pt)  # type: ignore
+    # Concatenate iterators only support str elements
+    concat = (adt.Kind.CONCAT_ITERATOR, adt.PrimitiveType.STRING)
+    paths[api.ConcatenateIterator[str]] = concat
+    paths[api.AsyncConcatenateIterator[str]] = concat
+    return paths
+
+
+# Common output annotations resolved with a single dict lookup
+# instead of walking get_origin/get_args and FieldType.from_type
+_OUTPUT_FAST_PATHS = _output_fast_paths()
+
+
 def _output_adt(tpe: type) -> adt.Output:
     if tpe is Any:
         print(
             'Warning: use of Any as output type is error prone and highly-discouraged'
         )
         return adt.Output(kind=adt.Kind.SINGLE, type=_any_type)  # type: ignore
+    try:
+        fast = _OUTPUT_FAST_PATHS.get(tpe)
+    except TypeError:
+        # Unhashable annotation, fall through to the generic path
+        fast = None
+    if fast is not None:
+        return adt.Output(kind=fast[0], type=fast[1])
     if inspect.isclass(tpe) and _check_parent(tpe, api.BaseModel):
         fields = {}
         for name, t in tpe.__annotations__.items():
@@ -355,12 +421,13 @@ def check_input(
                 f'invalid input value: {name}={repr(v)} fails constraint len() <= {adt_in.max_length}'
             )
         if adt_in.regex is not None:
-            p = re.compile(adt_in.regex)
+            p = adt_in.compiled_regex or _compile_regex(adt_in.regex)
             assert all(p.match(x) is not None for x in values), (
                 f'invalid input value: {name}={repr(v)} does not match regex {repr(adt_in.regex)}'
             )
         if adt_in.choices is not None:
-            assert all(x in adt_in.choices for x in values), (
+            choices = adt_in.choices if adt_in.choice_set is None else adt_in.choice_set
+            assert all(x in choices for x in values), (
                 f'invalid input value: {name}={repr(v)} does not match choices {repr(adt_in.choices)}'
             )
     return kwargs
@@ -400,27 +467,26 @@ def create_predictor(
     # and break all inspection logic
     import __future__
 
-    if (
-        hasattr(module, 'annotations')
-        and getattr(module, 'annotations') == __future__.annotations
-    ):
+    if getattr(module, 'annotations', None) == __future__.annotations:
         raise AssertionError(
             'predictor with "from __future__ import annotations" is not supported'
         )
 
     fullname = f'{module_name}.{predictor_name}'
-    assert hasattr(module, predictor_name), f'predictor not found: {fullname}'
-    p = getattr(module, predictor_name)
+    p = getattr(module, predictor_name, None)
+    assert p is not None, f'predictor not found: {fullname}'
     if inspect.isclass(p):
         assert _check_parent(p, api.BasePredictor), (
             f'predictor {fullname} does not inherit cog.BasePredictor'
         )
 
-        assert hasattr(p, 'setup'), f'setup method not found: {fullname}'
-        assert hasattr(p, 'predict'), f'predict method not found: {fullname}'
-        _validate_setup(_unwrap(getattr(p, 'setup')))
+        setup_fn = getattr(p, 'setup', None)
+        assert setup_fn is not None, f'setup method not found: {fullname}'
         predict_fn_name = 'predict'
-        predict_fn = _unwrap(getattr(p, predict_fn_name))
+        predict_fn = getattr(p, predict_fn_name, None)
+        assert predict_fn is not None, f'predict method not found: {fullname}'
+        _validate_setup(_unwrap(setup_fn))
+        predict_fn = _unwrap(predict_fn)
         is_class_fn = True
     elif inspect.isfunction(p):
         predict_fn_name = predictor_name
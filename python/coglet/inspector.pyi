@@ -21,6 +21,7 @@ class AnyType:
 
 
 _any_type = ...
+_OUTPUT_FAST_PATHS = ...
 def check_input(adt_ins: Dict[str, adt.Input], inputs: Dict[str, Any]) -> Dict[str, Any]:
     ...
 
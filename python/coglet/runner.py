@@ -124,10 +124,8 @@ class Runner:
 
     # functions can return regular values or generators, not both
     def is_iter(self) -> bool:
-        return self.output.kind in {
-            adt.Kind.ITERATOR,
-            adt.Kind.CONCAT_ITERATOR,
-        }
+        kind = self.output.kind
+        return kind is adt.Kind.ITERATOR or kind is adt.Kind.CONCAT_ITERATOR
 
     async def predict(self, inputs: Dict[str, Any]) -> Any:
         assert not self.is_iter(), 'predict returns iterator, call predict_iter instead'
@@ -1,10 +1,13 @@
 import json
-import os.path
+import pathlib
 from dataclasses import MISSING, Field
 from typing import Any, Dict
 
 from coglet import adt
 
+# Static template, kept as bytes and re-parsed per call as a cheap deep copy
+_OPENAPI_TEMPLATE = pathlib.Path(__file__).with_name('openapi.json').read_bytes()
+
 
 def to_json_input(predictor: adt.Predictor) -> Dict[str, Any]:
     in_schema: Dict[str, Any] = {
@@ -34,10 +37,8 @@ def to_json_input(predictor: adt.Predictor) -> Dict[str, Any]:
         # <name>:list[<type>] = Input() - "required"
         # <name>:list[<type>] = Input(default=[<value>]) - not "required", has "default"
         if adt_in.default is None:
-            if adt_in.type.repetition in {
-                adt.Repetition.REQUIRED,
-                adt.Repetition.REPEATED,
-            }:
+            # REQUIRED or REPEATED
+            if adt_in.type.repetition is not adt.Repetition.OPTIONAL:
                 required.append(name)
         else:
             # Handle dataclass fields by extracting the actual default value
@@ -61,20 +62,20 @@ def to_json_input(predictor: adt.Predictor) -> Dict[str, Any]:
         if adt_in.type.repetition is adt.Repetition.OPTIONAL:
             prop['nullable'] = True
 
-        if adt_in.description is not None:
-            prop['description'] = adt_in.description
-        if adt_in.ge is not None:
-            prop['minimum'] = adt_in.ge
-        if adt_in.le is not None:
-            prop['maximum'] = adt_in.le
-        if adt_in.min_length is not None:
-            prop['minLength'] = adt_in.min_length
-        if adt_in.max_length is not None:
-            prop['maxLength'] = adt_in.max_length
-        if adt_in.regex is not None:
-            prop['pattern'] = adt_in.regex
-        if adt_in.deprecated is not None:
-            prop['deprecated'] = adt_in.deprecated
+        # Optional constraints, in one update instead of a branch per key
+        prop.update(
+            (k, v)
+            for k, v in (
+                ('description', adt_in.description),
+                ('minimum', adt_in.ge),
+                ('maximum', adt_in.le),
+                ('minLength', adt_in.min_length),
+                ('maxLength', adt_in.max_length),
+                ('pattern', adt_in.regex),
+                ('deprecated', adt_in.deprecated),
+            )
+            if v is not None
+        )
         in_schema['properties'][name] = prop
     if len(required) > 0:
         in_schema['required'] = required
@@ -101,10 +102,9 @@ def to_json_output(predictor: adt.Predictor) -> Dict[str, Any]:
 
 
 def to_json_schema(predictor: adt.Predictor) -> Dict[str, Any]:
-    path = os.path.join(os.path.dirname(__file__), 'openapi.json')
-    with open(path, 'r') as f:
-        schema = json.load(f)
-    schema['components']['schemas']['Input'] = to_json_input(predictor)
-    schema['components']['schemas']['Output'] = to_json_output(predictor)
-    schema['components']['schemas'].update(to_json_enums(predictor))
+    schema = json.loads(_OPENAPI_TEMPLATE)
+    components = schema['components']['schemas']
+    components['Input'] = to_json_input(predictor)
+    components['Output'] = to_json_output(predictor)
+    components.update(to_json_enums(predictor))
     return schema
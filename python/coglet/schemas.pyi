@@ -5,6 +5,7 @@ This type stub file was generated by pyright.
 from typing import Any, Dict
 from coglet import adt
 
+_OPENAPI_TEMPLATE = ...
 def to_json_input(predictor: adt.Predictor) -> Dict[str, Any]:
     ...
 
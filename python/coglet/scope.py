@@ -1,4 +1,5 @@
 import contextvars
+import re
 import sys
 from collections import defaultdict
 from typing import Any, Callable, Dict, Optional
@@ -68,44 +69,47 @@ def cleanup_prediction_context(pid: str) -> None:
     contexts.pop(pid, None)
 
 
+# Line breaks as written by print, logging and progress bars like tqdm
+_NEWLINE_RE = re.compile(r'\r\n?|\n')
+
+
 def ctx_write(write_fn) -> Callable[[str], int]:
     def _write(s: str) -> int:
         if len(s) == 0:
             return 0
-        pid = ctx_pid.get()
-        prefix = f'[pid={pid}] ' if pid is not None else ''
-        if pid is None:
-            pid = 'logger'
-
         # Large input, bypass buffer and write truncated line directly
         if len(s) > 16384:
+            pid = ctx_pid.get()
+            prefix = f'[pid={pid}] ' if pid is not None else ''
             return write_fn(prefix + s[:16384] + ' ... truncated\n')
 
-        n = 0
-        # s = s.replace('\r', '\n')
-        if s[-1] in {'\n', '\r'}:
-            # Input ends with new line, flush buffer and input
-            b = ctx_write_buf.pop(pid, '')
-            lines = s.splitlines()
-            n += write_fn(b + lines[0] + '\n')
-            for line in lines[1:]:
-                n += write_fn(prefix + line + '\n')
-            ctx_write_buf[pid] = prefix
-        elif '\n' in s or '\r' in s:
-            # Input contains new line but does not end
-            b = ctx_write_buf.pop(pid, '')
-            lines = s.splitlines()
-            n += write_fn(b + lines[0] + '\n')
-            # Flush all but last partial line
-            for line in lines[1:-1]:
-                n += write_fn(prefix + line + '\n')
-            ctx_write_buf[pid] = prefix + lines[-1]
+        pid = ctx_pid.get()
+        if pid is None:
+            # Fast path outside predictions, complete lines with nothing buffered
+            # need no prefix or splitting and go straight to the original write
+            if s[-1] == '\n' and '\r' not in s and not ctx_write_buf.get('logger'):
+                return write_fn(s)
+            pid = 'logger'
+            prefix = ''
         else:
+            prefix = f'[pid={pid}] '
+
+        # Single C-level pass to find all line breaks
+        lines = _NEWLINE_RE.split(s)
+        if len(lines) == 1:
             # No new line, append to buffer
             if pid not in ctx_write_buf:
                 ctx_write_buf[pid] = prefix + s
             else:
                 ctx_write_buf[pid] += s
-        return n
+            return 0
+
+        # Flush buffer and all complete lines in one write
+        # The last element is the trailing partial line, empty if input ends with a new line
+        b = ctx_write_buf.pop(pid, '')
+        out = [b + lines[0]]
+        out.extend(prefix + line for line in lines[1:-1])
+        ctx_write_buf[pid] = prefix + lines[-1]
+        return write_fn('\n'.join(out) + '\n')
 
     return _write
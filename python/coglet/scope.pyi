@@ -41,6 +41,7 @@ def cleanup_prediction_context(pid: str) -> None:
     """Clean up all context for a prediction, flushing any remaining output"""
     ...
 
+_NEWLINE_RE = ...
 def ctx_write(write_fn) -> Callable[[str], int]:
     ...
 
@@ -1,10 +1,41 @@
+import ctypes
+import json
 import os
+import struct
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Callable, Optional
 
 from coglet import api
 
 
+def json_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    return json.dumps(obj, default=default).encode('utf-8')
+
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct('iIII')
+
+
+def inotify_watch(path: str, mask: int, flags: int = IN_CLOEXEC) -> Optional[int]:
+    """Inotify fd watching directory path for mask events, None if unavailable."""
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(flags)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(path), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
 def now_iso() -> str:
     # Go: time.Now().UTC().Format("2006-01-02T15:04:05.999999-07:00")
     return datetime.now(timezone.utc).isoformat()
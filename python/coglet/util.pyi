@@ -2,6 +2,20 @@
 This type stub file was generated by pyright.
 """
 
+from typing import Any, Callable, Optional
+
+IN_CLOSE_WRITE = ...
+IN_MOVED_TO = ...
+IN_NONBLOCK = ...
+IN_CLOEXEC = ...
+INOTIFY_EVENT = ...
+def inotify_watch(path: str, mask: int, flags: int = ...) -> Optional[int]:
+    """Inotify fd watching directory path for mask events, None if unavailable."""
+    ...
+
+def json_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = ...) -> bytes:
+    ...
+
 def now_iso() -> str:
     ...
 
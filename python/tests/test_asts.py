@@ -0,0 +1,40 @@
+import textwrap
+
+import pytest
+
+from coglet import asts
+
+BAD_PREDICT = """\
+def predict(self, s: str = Input(default=None)) -> str:
+    return s
+"""
+
+
+def _inspect(tmp_path, src: str) -> None:
+    path = tmp_path / 'predict.py'
+    path.write_text(src)
+    asts.inspect(path.as_posix(), 'predict')
+
+
+def _nest(header: str, body: str, footer: str = '') -> str:
+    return header + '\n' + textwrap.indent(body, '    ') + footer
+
+
+@pytest.mark.parametrize(
+    'src',
+    [
+        BAD_PREDICT,
+        _nest('class Predictor:', BAD_PREDICT),
+        _nest('if True:', BAD_PREDICT),
+        _nest('try:', BAD_PREDICT, 'except ImportError:\n    pass\n'),
+        _nest('with open(__file__):', BAD_PREDICT),
+        _nest('if True:', _nest('class Predictor:', BAD_PREDICT)),
+    ],
+)
+def test_inspect_finds_predict(tmp_path, src):
+    with pytest.raises(AssertionError, match='must be Optional'):
+        _inspect(tmp_path, src)
+
+
+def test_inspect_skips_function_bodies(tmp_path):
+    _inspect(tmp_path, _nest('def outer():', BAD_PREDICT))
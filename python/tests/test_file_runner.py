@@ -1,9 +1,13 @@
+import asyncio
+import http.server
 import json
+import logging
 import os.path
 import signal
 import socket
 import subprocess
 import sys
+import threading
 import time
 import urllib.request
 import uuid
@@ -13,7 +17,7 @@ from typing import Dict, List, Optional
 
 import pytest
 
-from coglet import file_runner
+from coglet import file_runner, util
 
 
 def find_free_port() -> int:
@@ -260,3 +264,193 @@ def test_file_runner_predict_canceled(tmp_path, ipc_server):
     stop_file = os.path.join(tmp_path, 'stop')
     Path(stop_file).touch()
     rt.stop()
+
+
+@pytest.mark.parametrize('inotify', [True, False])
+def test_file_runner_wakeup(tmp_path, ipc_server, monkeypatch, inotify):
+    if inotify and sys.platform != 'linux':
+        pytest.skip('requires inotify')
+
+    # Run in-process to control how the runner watches working_dir
+    fds = []
+    inotify_watch = util.inotify_watch
+
+    def watch(*args) -> Optional[int]:
+        # No inotify, e.g. macOS or watch limits exhausted, falls back to polling
+        fd = inotify_watch(*args) if inotify else None
+        fds.append(fd)
+        return fd
+
+    monkeypatch.setattr(util, 'inotify_watch', watch)
+    name = f'runner-{uuid.uuid4()}'
+    fr = file_runner.FileRunner(
+        logger=logging.getLogger('test'),
+        name=name,
+        ipc_url=f'http://localhost:{ipc_server}/_ipc',
+        working_dir=tmp_path.as_posix(),
+        config=file_runner.Config(
+            module_name='tests.runners.sleep',
+            predictor_name='Predictor',
+            max_concurrency=1,
+        ),
+    )
+
+    req_file = os.path.join(tmp_path, 'request-a.json')
+    resp_file = os.path.join(tmp_path, 'response-a-00000.json')
+    latencies = []
+
+    def drive() -> None:
+        wait_for_file(os.path.join(tmp_path, 'ready'))
+        for _ in range(3):
+            start = time.monotonic()
+            with open(req_file, 'w') as f:
+                json.dump({'input': {'i': 0, 's': 'bar'}}, f)
+            while os.path.exists(req_file):
+                time.sleep(0.001)
+            latencies.append(time.monotonic() - start)
+            wait_for_file(resp_file)
+            os.unlink(resp_file)
+        Path(os.path.join(tmp_path, 'stop')).touch()
+
+    handlers = {s: signal.getsignal(s) for s in (signal.SIGUSR1, signal.SIGINT)}
+    driver = threading.Thread(target=drive)
+    driver.start()
+    try:
+        code = asyncio.run(asyncio.wait_for(fr.start(), 30))
+    finally:
+        driver.join()
+        for s, h in handlers.items():
+            signal.signal(s, h)
+
+    assert code == 0
+    assert len(fds) == 1
+    if inotify:
+        assert fds[0] is not None
+        # Watch is closed when the runner stops
+        with pytest.raises(OSError):
+            os.fstat(fds[0])
+        # Requests are picked up on the close event instead of the next poll
+        assert min(latencies) < 0.05
+    else:
+        assert fds[0] is None
+        assert max(latencies) < 0.5
+
+
+class _IPCHandler(http.server.BaseHTTPRequestHandler):
+    # Keep-alive, but drop the connection after each response like an idle timeout
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.server.hang:  # type: ignore
+            time.sleep(1)
+            return
+        self.server.statuses.append(json.loads(body)['status'])  # type: ignore
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ipc_stub():
+    server = http.server.ThreadingHTTPServer(('localhost', 0), _IPCHandler)
+    server.daemon_threads = True
+    server.statuses = []  # type: ignore
+    server.hang = False  # type: ignore
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _ipc_runner(server) -> file_runner.FileRunner:
+    return file_runner.FileRunner(
+        logger=logging.getLogger('test'),
+        name='runner',
+        ipc_url=f'http://localhost:{server.server_address[1]}/_ipc',
+        working_dir='/nonexistent',
+        config=file_runner.Config(
+            module_name='tests.runners.sleep',
+            predictor_name='Predictor',
+            max_concurrency=1,
+        ),
+    )
+
+
+def test_ipc_thread(ipc_stub):
+    fr = _ipc_runner(ipc_stub)
+    statuses = [
+        file_runner.FileRunner.IPC_READY,
+        file_runner.FileRunner.IPC_BUSY,
+        file_runner.FileRunner.IPC_OUTPUT,
+        file_runner.FileRunner.IPC_READY,
+    ]
+    for s in statuses:
+        fr._send_ipc(s)
+    # Stop delivers all queued statuses in order
+    # The server drops every keep-alive connection, so each post after the first is retried
+    fr._stop_ipc()
+    assert ipc_stub.statuses == statuses
+    assert fr._ipc_thread is None
+    assert fr._ipc_conn is None
+
+
+def test_ipc_thread_timeout(ipc_stub, monkeypatch):
+    monkeypatch.setattr(file_runner.FileRunner, 'IPC_TIMEOUT', 0.2)
+    ipc_stub.hang = True
+    fr = _ipc_runner(ipc_stub)
+    fr._send_ipc(file_runner.FileRunner.IPC_READY)
+    fr._send_ipc(file_runner.FileRunner.IPC_BUSY)
+    start = time.monotonic()
+    fr._stop_ipc()
+    # Timeouts are not retried, the status may already have been delivered
+    assert time.monotonic() - start < 1.0
+    assert ipc_stub.statuses == []
+
+
+def test_partial_response_trailing_flush(tmp_path, ipc_stub):
+    class Output:
+        @staticmethod
+        def json_encode(o):
+            return o
+
+    class Runner:
+        inputs: Dict[str, object] = {}
+        output = Output()
+
+        @staticmethod
+        def is_iter() -> bool:
+            return True
+
+        @staticmethod
+        async def predict_iter(_):
+            yield 'a'
+            # Inside the throttle interval, must not wait for the next yield
+            yield 'b'
+            await asyncio.sleep(0.5)
+            yield 'c'
+
+    fr = _ipc_runner(ipc_stub)
+    fr.working_dir = tmp_path.as_posix()
+    fr.runner = Runner()  # type: ignore
+    req = {'input': {}, 'webhook': 'http://example.com'}
+    asyncio.run(fr._predict('a', req))
+    fr._stop_ipc()
+
+    resps = []
+    for epoch in range(5):
+        with open(os.path.join(tmp_path, f'response-a-{epoch:05d}.json')) as f:
+            resp = json.load(f)
+        resps.append((resp['status'], resp.get('output')))
+    assert resps == [
+        ('starting', None),
+        ('processing', ['a']),
+        ('processing', ['a', 'b']),
+        ('processing', ['a', 'b', 'c']),
+        ('succeeded', ['a', 'b', 'c']),
+    ]
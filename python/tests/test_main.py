@@ -0,0 +1,98 @@
+import json
+import logging
+import os.path
+import select
+import sys
+import threading
+import time
+
+import pytest
+
+from coglet import __main__, file_runner
+
+
+def _touch_later(path: str, delay: float) -> threading.Timer:
+    def touch():
+        with open(path, 'w') as f:
+            f.write('{}')
+
+    timer = threading.Timer(delay, touch)
+    timer.start()
+    return timer
+
+
+def test_pre_setup_waits_for_config(tmp_path):
+    conf_file = os.path.join(tmp_path, 'config.json')
+    conf = {
+        'module_name': 'tests.runners.sleep',
+        'predictor_name': 'Predictor',
+        'max_concurrency': 2,
+    }
+
+    def write_config():
+        with open(conf_file, 'w') as f:
+            json.dump(conf, f)
+
+    timer = threading.Timer(0.5, write_config)
+    timer.start()
+    config = __main__.pre_setup(logging.getLogger('test'), tmp_path.as_posix())
+    timer.join()
+    assert config == file_runner.Config(
+        module_name='tests.runners.sleep',
+        predictor_name='Predictor',
+        max_concurrency=2,
+    )
+    assert not os.path.exists(conf_file)
+
+
+def test_wait_for_file_exists(tmp_path):
+    path = os.path.join(tmp_path, 'f')
+    open(path, 'w').close()
+    assert __main__._wait_for_file(path, 1.0)
+
+
+def test_wait_for_file_timeout(tmp_path):
+    path = os.path.join(tmp_path, 'f')
+    start = time.monotonic()
+    assert not __main__._wait_for_file(path, 0.2)
+    assert time.monotonic() - start >= 0.2
+
+
+def test_wait_for_file_poll_fallback(tmp_path, monkeypatch):
+    # No file system events available, e.g. inotify limits exhausted
+    monkeypatch.setattr(__main__, '_wait_inotify', lambda path, timeout: None)
+    monkeypatch.setattr(__main__, '_wait_kqueue', lambda path, timeout: None)
+    path = os.path.join(tmp_path, 'f')
+    timer = _touch_later(path, 0.2)
+    assert __main__._wait_for_file(path, 5.0)
+    timer.join()
+    assert not __main__._wait_for_file(os.path.join(tmp_path, 'g'), 0.1)
+
+
+def test_wait_kqueue_unavailable(tmp_path, monkeypatch):
+    monkeypatch.delattr(select, 'kqueue', raising=False)
+    assert __main__._wait_kqueue(os.path.join(tmp_path, 'f'), 0.1) is None
+
+
+@pytest.mark.skipif(sys.platform != 'darwin', reason='requires macOS')
+def test_wait_kqueue(tmp_path):
+    path = os.path.join(tmp_path, 'f')
+    timer = _touch_later(path, 0.2)
+    assert __main__._wait_kqueue(path, 5.0)
+    timer.join()
+    assert not __main__._wait_kqueue(os.path.join(tmp_path, 'g'), 0.1)
+
+
+def test_pre_setup_joins_torch_import(tmp_path, monkeypatch):
+    done = threading.Event()
+
+    def slow_import(name):
+        time.sleep(0.2)
+        done.set()
+        raise ModuleNotFoundError(name)
+
+    monkeypatch.setenv('R8_TORCH_VERSION', '2.0')
+    monkeypatch.setattr(__main__.importlib, 'import_module', slow_import)
+    monkeypatch.setattr(__main__, '_wait_for_file', lambda path, timeout: False)
+    assert __main__.pre_setup(logging.getLogger('test'), tmp_path.as_posix()) is None
+    assert done.is_set()
@@ -0,0 +1,41 @@
+from typing import List
+
+import pytest
+
+from coglet import scope
+
+
+@pytest.fixture
+def writes():
+    out: List[str] = []
+    token = scope.ctx_pid.set('p1')
+    yield out
+    scope.ctx_pid.reset(token)
+    scope.ctx_write_buf.clear()
+
+
+def _write(out: List[str], *chunks: str) -> str:
+    w = scope.ctx_write(out.append)
+    for c in chunks:
+        w(c)
+    return ''.join(out)
+
+
+@pytest.mark.parametrize('sep', ['\n', '\r', '\r\n'])
+def test_ctx_write_line_breaks(writes, sep):
+    # A partial write first so the buffer holds the prefixed line start
+    assert _write(writes, 'foo', f'{sep}bar{sep}') == '[pid=p1] foo\n[pid=p1] bar\n'
+
+
+def test_ctx_write_buffers_partial_lines(writes):
+    assert _write(writes, 'foo', 'bar') == ''
+    assert _write(writes, 'baz\nqux') == '[pid=p1] foobarbaz\n'
+    assert scope.ctx_write_buf['p1'] == '[pid=p1] qux'
+
+
+@pytest.mark.parametrize(
+    'sep', ['\v', '\f', '\x1c', '\x1d', '\x1e', '\x85', '\u2028', '\u2029']
+)
+def test_ctx_write_other_separators_stay_in_line(writes, sep):
+    # Only \n, \r and \r\n end a log line, unlike str.splitlines()
+    assert _write(writes, 'foo', f'{sep}bar\n') == f'[pid=p1] foo{sep}bar\n'
@@ -0,0 +1,32 @@
+import datetime
+import enum
+import json
+import math
+
+import pytest
+
+from coglet import api, util
+
+
+class Color(enum.Enum):
+    RED = 'red'
+
+
+def test_json_dumps_big_int():
+    assert json.loads(util.json_dumps({'x': 2**70})) == {'x': 2**70}
+
+
+def test_json_dumps_nan():
+    out = util.json_dumps([math.nan, math.inf])
+    assert out == b'[NaN, Infinity]'
+
+
+@pytest.mark.parametrize('obj', [datetime.datetime(2020, 1, 1), Color.RED, object()])
+def test_json_dumps_unsupported(obj):
+    with pytest.raises(TypeError, match='is not JSON serializable'):
+        util.json_dumps({'x': obj}, default=util.output_json)
+
+
+def test_json_dumps_secret():
+    out = util.json_dumps({'x': api.Secret('foobar')}, default=util.output_json)
+    assert json.loads(out) == {'x': '**********'}